@@ -19,20 +19,39 @@ Calibration Certificate Downloader (Qt6)
 
 from __future__ import annotations
 
+import json
 import re
+import shutil
 import sys
 import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import ExitStack
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import date, datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Iterator, List, Optional, Tuple
 from urllib.parse import (
     urljoin, urlparse, unquote, parse_qsl, urlencode, urlunparse
 )
 
 import requests
-from bs4 import BeautifulSoup
-from PyPDF2 import PdfMerger
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+from bs4 import BeautifulSoup, FeatureNotFound
+from pypdf import PdfWriter
+
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+except ImportError:  # listing pages fall back to BeautifulSoup
+    etree = lxml_html = None
+
+try:
+    import pikepdf
+except ImportError:  # merges fall back to pypdf
+    pikepdf = None
 
 from PyQt6.QtCore import QObject, pyqtSignal, QThread
 from PyQt6.QtWidgets import (
@@ -68,13 +87,38 @@ UA = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
     "(KHTML, like Gecko) Chrome/122.0 Safari/537.36"
 )
+# Detail pages are fetched concurrently; keep-alive pool sized above worker count
+DETAIL_WORKERS = 8
+HTTP_POOL_SIZE = 32
+SP_PREFETCH = 8  # synthesized sp= listing pages fetched per window
+PDF_WORKERS = 4  # main + extras of one item downloaded together (8 x 4 = pool size)
+ETAG_CACHE_NAME = ".etag_cache.json"  # detail URL -> validators + saved file
+
 DEFAULT_HEADERS = {
     "User-Agent": UA,
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
 }
 
+
+def _pick_html_parser() -> str:
+    """Prefer the C-based lxml parser; fall back to the stdlib one if missing."""
+    try:
+        BeautifulSoup("", "lxml")
+        return "lxml"
+    except FeatureNotFound:
+        return "html.parser"
+
+
+HTML_PARSER = _pick_html_parser()
+
 # ----------------------------- Helpers -----------------------------
 
+_SAFE_FN_RE = re.compile(r'[<>:"/\\|?*]+')
+_CD_RE = re.compile(r'filename\*?=(?:UTF-8\'\')?"?([^";]+)"?', re.I)
+_ITEMZOOM_RE = re.compile(r"(itemzoom[^'\"()]+)", re.I)
+_TOOL_RE = re.compile(r"\bVHM-COM\d{3,6}\b", re.I)
+_DATE_RE = re.compile(r"(\d{1,4})([/-])\d{1,2}\2(\d{1,4})$")
+
 def parse_cookie_string(raw: str) -> dict:
     jar = {}
     for p in (raw or "").split(";"):
@@ -86,34 +130,77 @@ def parse_cookie_string(raw: str) -> dict:
     return jar
 
 
-def ensure_unique(path: Path) -> Path:
-    if not path.exists():
+def ensure_unique(path: Path, reserved: Optional[set] = None) -> Path:
+    """Return path, or 'name (i).ext' if taken on disk or in `reserved`."""
+    def taken(p: Path) -> bool:
+        return p.exists() or (reserved is not None and p in reserved)
+
+    if not taken(path):
         return path
     i = 1
     stem, suffix = path.stem, path.suffix
     while True:
         candidate = path.with_name(f"{stem} ({i}){suffix}")
-        if not candidate.exists():
+        if not taken(candidate):
             return candidate
         i += 1
 
 
+def load_etag_cache(out_dir: Path) -> dict:
+    try:
+        with open(out_dir / ETAG_CACHE_NAME, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def save_etag_cache(out_dir: Path, cache: dict) -> None:
+    """Write via a temp file + os.replace so a crash never leaves half a file."""
+    path = out_dir / ETAG_CACHE_NAME
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=1)
+    os.replace(tmp, path)
+
+
 def safe_filename(name: str) -> str:
-    return re.sub(r'[<>:"/\\|?*]+', "-", name).strip().strip(".")
+    return _SAFE_FN_RE.sub("-", name).strip().strip(".")
+
+
+_DATE_FMTS = (
+    "%m/%d/%Y", "%m/%d/%y", "%m-%d-%Y", "%m-%d-%y",
+    "%Y-%m-%d", "%Y/%m/%d", "%d-%m-%Y", "%d/%m/%Y"
+)
+
+
+def _date_fmts_for(s: str) -> Tuple[str, ...]:
+    """Pick the candidate formats from the field widths/separator (same order as _DATE_FMTS)."""
+    m = _DATE_RE.match(s)
+    if not m:
+        return _DATE_FMTS
+    first, sep, last = m.group(1), m.group(2), m.group(3)
+    if len(first) == 4:
+        return (f"%Y{sep}%m{sep}%d",)
+    if len(last) == 2:
+        return (f"%m{sep}%d{sep}%Y", f"%m{sep}%d{sep}%y")
+    return (f"%m{sep}%d{sep}%Y", f"%d{sep}%m{sep}%Y")
 
 
 def to_iso_date(s: str) -> Optional[str]:
     if not s:
         return None
     s = s.strip().replace("\xa0", " ")
-    fmts = [
-        "%m/%d/%Y", "%m/%d/%y", "%m-%d-%Y", "%m-%d-%y",
-        "%Y-%m-%d", "%Y/%m/%d", "%d-%m-%Y", "%d/%m/%Y"
-    ]
-    for fmt in fmts:
+    # Already ISO: no strptime needed, but still reject impossible dates
+    if len(s) == 10 and s[4] == "-" and s[7] == "-" and s[:4].isdigit() and s[5:7].isdigit() and s[8:10].isdigit():
         try:
-            from datetime import datetime as _dt
-            dt = _dt.strptime(s, fmt)
+            date.fromisoformat(s)
+        except ValueError:
+            return None
+        return s
+    for fmt in _date_fmts_for(s):
+        try:
+            dt = datetime.strptime(s, fmt)
             if dt.year < 100:
                 dt = dt.replace(year=2000 + dt.year)
             return dt.strftime("%Y-%m-%d")
@@ -124,13 +211,14 @@ def to_iso_date(s: str) -> Optional[str]:
 
 def url_filename_from_response(resp: requests.Response, fallback_url: str) -> str:
     cd = resp.headers.get("Content-Disposition", "")
-    m = re.search(r'filename\*?=(?:UTF-8\'\')?"?([^";]+)"?', cd, flags=re.I)
+    m = _CD_RE.search(cd)
     if m:
         return unquote(m.group(1).strip('"'))
     name = Path(unquote(urlparse(resp.url or fallback_url).path)).name
     return name or "download.pdf"
 
 
+@lru_cache(maxsize=1024)  # row labels repeat on every detail page
 def normalize_label(s: str) -> str:
     return " ".join(s.replace("\xa0", " ").strip().lower().replace(":", "").split())
 
@@ -149,29 +237,57 @@ def set_query_param(url: str, **params) -> str:
 
 # ------------------------- Parsing functions -------------------------
 
+_ANCHORS_XPATH = etree.XPath("//a[@href]") if etree is not None else None
+_LXML_PARSER = lxml_html.HTMLParser(encoding="utf-8") if lxml_html is not None else None
+
+
+def _iter_anchors(html: str) -> Iterator[Tuple[str, object]]:
+    """
+    Yield (href, anchor) for every <a href> on a listing page.
+    Uses lxml + compiled XPath when available (no soup build), else BeautifulSoup.
+    """
+    if lxml_html is not None:
+        if not html.strip():
+            return
+        # Parse bytes so pages with an XML encoding declaration are accepted
+        doc = lxml_html.fromstring(html.encode("utf-8"), parser=_LXML_PARSER)
+        for a in _ANCHORS_XPATH(doc):
+            yield a.get("href"), a
+    else:
+        for a in BeautifulSoup(html, HTML_PARSER).find_all("a", href=True):
+            yield a["href"], a
+
+
+def _anchor_text(a) -> str:
+    """Whitespace-normalized anchor text (same result for lxml and bs4 nodes)."""
+    if lxml_html is not None:
+        return " ".join(a.text_content().split())
+    return a.get_text(" ", strip=True) or ""
+
+
 def extract_detail_urls_from_listing(html: str, base_url: str) -> List[str]:
     """Find all 'VIEW' links to itemzoom.aspx?item=..."""
-    soup = BeautifulSoup(html, "html.parser")
     urls: List[str] = []
 
     def is_detail_href(href: str) -> bool:
         h = href.lower()
         return ("itemzoom" in h and "item=" in h) or ("itemzoom.aspx" in h)
 
-    for a in soup.find_all("a", href=True):
-        href = a["href"].strip()
-        text = (a.get_text(" ", strip=True) or "").strip().lower()
-        actual = href
+    for href, a in _iter_anchors(html):
+        actual = href.strip()
 
         # Unwrap simple javascript: links pointing at itemzoom
         if actual.lower().startswith("javascript:"):
-            m = re.search(r"(itemzoom[^'\"()]+)", actual, flags=re.I)
+            m = _ITEMZOOM_RE.search(actual)
             if m:
                 actual = m.group(1)
 
-        if is_detail_href(actual) or (text.startswith("view") and "item=" in actual.lower()):
-            abs_url = urljoin(base_url, actual)
-            urls.append(abs_url)
+        if is_detail_href(actual):
+            urls.append(urljoin(base_url, actual))
+            continue
+        # Anchor text walks all descendants; only needed for the 'VIEW' fallback
+        if "item=" in actual.lower() and _anchor_text(a).lower().startswith("view"):
+            urls.append(urljoin(base_url, actual))
 
     # De-duplicate while preserving order
     seen = set()
@@ -183,20 +299,24 @@ def extract_detail_urls_from_listing(html: str, base_url: str) -> List[str]:
     return unique
 
 
+_PAGE_HREF_TOKENS = ("page=", "pagenum", "startrow", "start=", "sp=")
+_PAGE_LINK_TEXTS = frozenset({"next", "prev", "previous", ">>", "<<"})
+
+
 def discover_pagination_links(html: str, base_url: str) -> List[str]:
     """
     Find explicit pagination links on the listing page (same host).
     Now also recognizes anchors containing 'sp=' (your site's offset param).
     """
-    soup = BeautifulSoup(html, "html.parser")
     pages: List[str] = []
-    for a in soup.find_all("a", href=True):
-        href = a["href"].strip()
-        text = (a.get_text(" ", strip=True) or "").strip().lower()
+    for href, a in _iter_anchors(html):
+        href = href.strip()
         hlow = href.lower()
-        if any(t in hlow for t in ["page=", "pagenum", "startrow", "start=", "sp="]) or \
-           text in {"next", "prev", "previous", ">>", "<<"} or \
-           text.isdigit():
+        if any(t in hlow for t in _PAGE_HREF_TOKENS):
+            pages.append(urljoin(base_url, href))
+            continue
+        text = _anchor_text(a).lower()
+        if text in _PAGE_LINK_TEXTS or text.isdigit():
             pages.append(urljoin(base_url, href))
 
     base_parsed = urlparse(base_url)
@@ -235,68 +355,47 @@ def synthesize_sp_pages(session: requests.Session,
     q = dict(parse_qsl(pu.query, keep_blank_values=True))
     start_sp = int(q.get("sp", "0") or "0")
 
-    # Iterate next pages: sp = start_sp + step, +2*step, ...
-    for i in range(1, max_pages + 1):
-        next_sp = start_sp + i * step
-        next_url = set_query_param(first_url, sp=next_sp)
+    def fetch(url: str):
         try:
-            r = session.get(next_url, headers={**DEFAULT_HEADERS, "Referer": first_url}, timeout=30)
+            r = session.get(url, headers={"Referer": first_url}, timeout=30)
             r.raise_for_status()
-            html = r.text
+            return r.text, None
         except requests.RequestException as e:
-            log_cb(f"   ⚠️  Could not fetch synthesized page {next_url}: {e}")
-            break
+            return None, e
 
-        # Extract detail URLs; stop when no items found
-        items = extract_detail_urls_from_listing(html, base_url=next_url)
-        log_cb(f"   Synthesized page {i+1}: sp={next_sp} -> {len(items)} item(s)")
-        if not items:
-            break
-
-        pages.append(next_url)
-
-        # Continue until a page returns fewer than step? We simply continue until 0.
-        # Many sites return <step> on last page; we still try the next one which returns 0 and we stop.
+    # Iterate next pages: sp = start_sp + step, +2*step, ...
+    # Pages are independent, so fetch them SP_PREFETCH at a time and walk each
+    # window in order; the first failed or empty page ends the listing.
+    with ThreadPoolExecutor(max_workers=SP_PREFETCH) as pool:
+        for first_i in range(1, max_pages + 1, SP_PREFETCH):
+            window = range(first_i, min(first_i + SP_PREFETCH, max_pages + 1))
+            urls = [set_query_param(first_url, sp=start_sp + i * step) for i in window]
+            for i, next_url, (html, err) in zip(window, urls, pool.map(fetch, urls)):
+                if err is not None:
+                    log_cb(f"   ⚠️  Could not fetch synthesized page {next_url}: {err}")
+                    return pages
+
+                # Extract detail URLs; stop when no items found
+                items = extract_detail_urls_from_listing(html, base_url=next_url)
+                log_cb(f"   Synthesized page {i+1}: sp={start_sp + i * step} -> {len(items)} item(s)")
+                if not items:
+                    return pages
+
+                pages.append(next_url)
 
     return pages
 
 
-def extract_tool_and_due_from_soup(soup: BeautifulSoup) -> Tuple[Optional[str], Optional[str]]:
-    tool = None
-    due_raw = None
-
-    for tr in soup.find_all("tr"):
-        tds = tr.find_all("td")
-        if len(tds) < 2:
-            continue
-        label = normalize_label(tds[0].get_text(" ", strip=True))
-        value = tds[1].get_text(" ", strip=True).strip()
-
-        if ("tool #" in label) or label.startswith("tool #") or label == "tool #":
-            tool = value or tool
-
-        if ("calibration due date" in label) or ("calibration due date(s)" in label) or ("next calibration due date" in label):
-            due_raw = value or due_raw
-
-    if not tool:
-        full_text = soup.get_text(" ", strip=True)
-        m_tool = re.search(r"\bVHM-COM\d{3,6}\b", full_text, flags=re.I)
-        if m_tool:
-            tool = m_tool.group(0).upper()
-
-    due_iso = to_iso_date(due_raw) if due_raw else None
-    if tool:
-        tool = tool.strip().upper().replace(" ", "")
-
-    return tool, due_iso
-
-
-def get_pdf_links_from_soup(soup: BeautifulSoup, base_url: str) -> Tuple[Optional[str], List[str]]:
+def parse_detail_page(soup: BeautifulSoup, base_url: str) -> Tuple[Optional[str], Optional[str], Optional[str], List[str]]:
     """
-    Returns (main_pdf_url, extra_pdf_urls)
+    Returns (tool, due_iso, main_pdf_url, extra_pdf_urls) from one pass over the rows
+      - tool: row labeled 'Tool #' (falls back to a VHM-COM#### match in the page text)
+      - due: 'Calibration Due Date' row, as YYYY-MM-DD
       - main: row labeled 'Certificate (PDF Format)'
       - extras: 'Subcontracted Data' or 'CISG as Found Data'
     """
+    tool = None
+    due_raw = None
     main_pdf = None
     extras: List[str] = []
 
@@ -304,10 +403,15 @@ def get_pdf_links_from_soup(soup: BeautifulSoup, base_url: str) -> Tuple[Optiona
         tds = tr.find_all("td")
         if len(tds) < 2:
             continue
-
         label = normalize_label(tds[0].get_text(" ", strip=True))
         cell = tds[1]
 
+        if "tool #" in label:
+            tool = cell.get_text(" ", strip=True) or tool
+
+        if "calibration due date" in label:
+            due_raw = cell.get_text(" ", strip=True) or due_raw
+
         pdfs_here = []
         for a in cell.find_all("a", href=True):
             h = a["href"]
@@ -317,15 +421,25 @@ def get_pdf_links_from_soup(soup: BeautifulSoup, base_url: str) -> Tuple[Optiona
         if not pdfs_here:
             continue
 
-        if "certificate (pdf format" in label or label.startswith("certificate (pdf format"):
+        if "certificate (pdf format" in label:
             main_pdf = pdfs_here[0]
             continue
 
-        if ("subcontracted data" in label) or ("cisg as found data" in label) or ("cisg as found" in label):
+        if ("subcontracted data" in label) or ("cisg as found" in label):
             for p in pdfs_here:
                 if p not in extras:
                     extras.append(p)
 
+    if not tool:
+        full_text = soup.get_text(" ", strip=True)
+        m_tool = _TOOL_RE.search(full_text)
+        if m_tool:
+            tool = m_tool.group(0).upper()
+
+    due_iso = to_iso_date(due_raw) if due_raw else None
+    if tool:
+        tool = tool.strip().upper().replace(" ", "")
+
     if not main_pdf:
         for a in soup.find_all("a", href=True):
             h = a["href"]
@@ -333,7 +447,28 @@ def get_pdf_links_from_soup(soup: BeautifulSoup, base_url: str) -> Tuple[Optiona
                 main_pdf = urljoin(base_url, h)
                 break
 
-    return main_pdf, extras
+    return tool, due_iso, main_pdf, extras
+
+
+def merge_pdfs(parts: List[Path], out_path: Path) -> None:
+    """Concatenate the pages of `parts` (in order) into out_path."""
+    if pikepdf is not None:
+        # libqpdf copies page objects by reference instead of re-parsing streams
+        # (sources stay open until the output is saved)
+        with ExitStack() as stack, pikepdf.Pdf.new() as out:
+            for p in parts:
+                src = stack.enter_context(pikepdf.Pdf.open(str(p)))
+                out.pages.extend(src.pages)
+            out.save(str(out_path))
+        return
+
+    # Skip outline/destination merging; only pages are needed
+    writer = PdfWriter()
+    for p in parts:
+        writer.append(str(p), import_outline=False)
+    with open(out_path, "wb") as f:
+        writer.write(f)
+    writer.close()
 
 
 # -------------------------- Worker (thread) --------------------------
@@ -358,6 +493,9 @@ class DownloaderWorker(QObject):
         self.params = params
         self._stop = False
         self.progress_value = 0
+        self._path_lock = threading.Lock()
+        self._reserved_paths: set = set()  # output paths claimed by pool threads
+        self._etag_cache: dict = {}  # guarded by _path_lock
 
     def stop(self):
         self._stop = True
@@ -370,6 +508,18 @@ class DownloaderWorker(QObject):
 
             s = requests.Session()
             s.headers.update(DEFAULT_HEADERS)
+            # Retry transient throttling/server errors with backoff instead of failing the item
+            retry = Retry(
+                total=5,
+                backoff_factor=0.5,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=("GET", "HEAD"),
+            )
+            adapter = HTTPAdapter(
+                pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=retry
+            )
+            s.mount("https://", adapter)
+            s.mount("http://", adapter)
             if self.params.cookie_string.strip():
                 s.cookies.update(parse_cookie_string(self.params.cookie_string))
 
@@ -384,7 +534,7 @@ class DownloaderWorker(QObject):
             self.status.emit("Fetching listing page…")
             self.log.emit(f"GET {listing_url}")
             try:
-                r = s.get(listing_url, headers=DEFAULT_HEADERS, timeout=30)
+                r = s.get(listing_url, timeout=30)
                 r.raise_for_status()
                 first_html = r.text
             except requests.RequestException as e:
@@ -392,7 +542,17 @@ class DownloaderWorker(QObject):
                 self.status.emit("Error")
                 return
 
-            detail_urls = extract_detail_urls_from_listing(first_html, base_url=listing_url)
+            # Deduplicate (preserving order) as URLs are collected
+            detail_urls: List[str] = []
+            seen_urls: set = set()
+
+            def add_detail_urls(items: List[str]):
+                for u in items:
+                    if u not in seen_urls:
+                        seen_urls.add(u)
+                        detail_urls.append(u)
+
+            add_detail_urls(extract_detail_urls_from_listing(first_html, base_url=listing_url))
             first_count = len(detail_urls)
             self.log.emit(f"Found {first_count} detail URL(s) on the first page.")
 
@@ -408,7 +568,7 @@ class DownloaderWorker(QObject):
                     self.status.emit(f"Following pagination link…")
                     self.log.emit(f"GET {p}")
                     try:
-                        rp = s.get(p, headers=DEFAULT_HEADERS, timeout=30)
+                        rp = s.get(p, timeout=30)
                         rp.raise_for_status()
                         html = rp.text
                     except requests.RequestException as e:
@@ -416,7 +576,7 @@ class DownloaderWorker(QObject):
                         continue
                     items = extract_detail_urls_from_listing(html, base_url=p)
                     self.log.emit(f"   -> {len(items)} item(s)")
-                    detail_urls.extend(items)
+                    add_detail_urls(items)
 
                 # 2b) If no links found, synthesize pages by sp=offsets
                 if len(links) == 0:
@@ -433,7 +593,7 @@ class DownloaderWorker(QObject):
                         if self._stop: break
                         self.log.emit(f"GET {p}")
                         try:
-                            rp = s.get(p, headers=DEFAULT_HEADERS, timeout=30)
+                            rp = s.get(p, timeout=30)
                             rp.raise_for_status()
                             html = rp.text
                         except requests.RequestException as e:
@@ -441,11 +601,8 @@ class DownloaderWorker(QObject):
                             continue
                         items = extract_detail_urls_from_listing(html, base_url=p)
                         self.log.emit(f"   -> {len(items)} item(s)")
-                        detail_urls.extend(items)
+                        add_detail_urls(items)
 
-            # Deduplicate preserve order
-            seen = set()
-            detail_urls = [u for u in detail_urls if not (u in seen or seen.add(u))]
             if not detail_urls:
                 self.log.emit("No detail URLs found. Check the listing URL/filters.")
                 self.status.emit("Nothing to do")
@@ -455,82 +612,29 @@ class DownloaderWorker(QObject):
             total_items = len(detail_urls)
             self.log.emit(f"Total unique detail URLs: {total_items}")
 
-            # 3) Process each detail URL
-            for idx, url in enumerate(detail_urls, start=1):
-                if self._stop:
-                    break
-                prefix = f"[{idx}/{total_items}]"
-                self.status.emit(f"{prefix} Fetching details page…")
-                self.log.emit(f"{prefix} GET {url}")
-
-                try:
-                    r = s.get(url, headers={**DEFAULT_HEADERS, "Referer": url}, timeout=30)
-                    r.raise_for_status()
-                    html = r.text
-                except requests.RequestException as e:
-                    self.log.emit(f"{prefix} ❌ Cannot load details page: {e}")
-                    self._update_progress(idx, total_items)
-                    continue
-
-                soup = BeautifulSoup(html, "html.parser")
-
-                tool, due_iso = extract_tool_and_due_from_soup(soup)
-                main_pdf, extras = get_pdf_links_from_soup(soup, url)
-
-                if not main_pdf:
-                    self.log.emit(f"{prefix} ❗ No certificate PDF found on page.")
-                    self._update_progress(idx, total_items)
-                    continue
-
-                # Desired output filename
-                if tool and due_iso:
-                    desired_name = f"{tool} due {due_iso}.pdf"
-                elif tool:
-                    desired_name = f"{tool}.pdf"
-                elif due_iso:
-                    desired_name = f"certificate due {due_iso}.pdf"
-                else:
-                    desired_name = "certificate.pdf"
-
-                desired_path = ensure_unique(self.params.output_dir / safe_filename(desired_name))
-
-                # Download & merge
-                self.status.emit(f"{prefix} Downloading PDF(s)…")
-                with tempfile.TemporaryDirectory() as td:
-                    tdir = Path(td)
-                    parts: List[Path] = []
-
-                    mp = self._download_to_temp(s, main_pdf, tdir, f"{prefix} main")
-                    if mp:
-                        parts.append(mp)
-                    else:
-                        self._update_progress(idx, total_items)
-                        continue
-
-                    for extra in extras:
-                        if self._stop:
-                            break
-                        ep = self._download_to_temp(s, extra, tdir, f"{prefix} extra")
-                        if ep:
-                            parts.append(ep)
+            self._etag_cache = load_etag_cache(self.params.output_dir)
 
+            # 3) Process detail URLs concurrently (independent, network-bound)
+            done = 0
+            with ThreadPoolExecutor(max_workers=DETAIL_WORKERS) as pool:
+                futures = [
+                    pool.submit(self._process_detail, s, idx, total_items, url)
+                    for idx, url in enumerate(detail_urls, start=1)
+                ]
+                for fut in as_completed(futures):
                     try:
-                        if len(parts) == 1:
-                            desired_path.write_bytes(parts[0].read_bytes())
-                            self.log.emit(f"{prefix} Saved: {desired_path.name}")
-                        else:
-                            self.status.emit(f"{prefix} Merging {len(parts)} files…")
-                            merger = PdfMerger()
-                            for p in parts:
-                                merger.append(str(p))
-                            with open(desired_path, "wb") as f:
-                                merger.write(f)
-                            merger.close()
-                            self.log.emit(f"{prefix} Saved (merged {len(parts)}): {desired_path.name}")
+                        processed = fut.result()
                     except Exception as e:
-                        self.log.emit(f"{prefix} ❌ Merge/save error: {e}")
+                        self.log.emit(f"❌ Unexpected error: {e}")
+                        processed = True
+                    if processed:
+                        done += 1
+                        self._update_progress(done, total_items)
 
-                self._update_progress(idx, total_items)
+            try:
+                save_etag_cache(self.params.output_dir, self._etag_cache)
+            except OSError as e:
+                self.log.emit(f"Could not update {ETAG_CACHE_NAME}: {e}")
 
             self.status.emit("Done")
             self.progress.emit(100 if not self._stop else self.progress_value)
@@ -548,16 +652,125 @@ class DownloaderWorker(QObject):
         self.progress_value = max(self.progress_value, min(100, pct))
         self.progress.emit(self.progress_value)
 
-    def _download_to_temp(self, session: requests.Session, url: str, tdir: Path, label: str) -> Optional[Path]:
+    def _process_detail(self, s: requests.Session, idx: int, total_items: int, url: str) -> bool:
+        """Fetch one detail page, download its PDF(s) and save/merge them.
+        Runs on a pool thread; returns False if skipped because of stop()."""
+        if self._stop:
+            return False
+        prefix = f"[{idx}/{total_items}]"
+        self.status.emit(f"{prefix} Fetching details page…")
+        self.log.emit(f"{prefix} GET {url}")
+
+        # Conditional GET: an unchanged page whose PDF is still on disk is skipped
+        headers = {"Referer": url}  # merged with session.headers by requests
+        with self._path_lock:
+            cached = self._etag_cache.get(url)
+        if cached and (self.params.output_dir / cached.get("file", "")).is_file():
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
         try:
-            r = session.get(url, stream=True, allow_redirects=True, timeout=60)
+            r = s.get(url, headers=headers, timeout=30)
             r.raise_for_status()
-            fname = url_filename_from_response(r, url)
-            out = tdir / (fname if fname.lower().endswith(".pdf") else f"{fname}.pdf")
-            with open(out, "wb") as f:
-                for chunk in r.iter_content(64 * 1024):
-                    if chunk:
-                        f.write(chunk)
+            if r.status_code == 304:
+                self.log.emit(f"{prefix} Unchanged, keeping {cached['file']}")
+                return True
+            html = r.text
+        except requests.RequestException as e:
+            self.log.emit(f"{prefix} ❌ Cannot load details page: {e}")
+            return True
+
+        soup = BeautifulSoup(html, HTML_PARSER)
+
+        tool, due_iso, main_pdf, extras = parse_detail_page(soup, url)
+
+        if not main_pdf:
+            self.log.emit(f"{prefix} ❗ No certificate PDF found on page.")
+            return True
+
+        # Desired output filename
+        if tool and due_iso:
+            desired_name = f"{tool} due {due_iso}.pdf"
+        elif tool:
+            desired_name = f"{tool}.pdf"
+        elif due_iso:
+            desired_name = f"certificate due {due_iso}.pdf"
+        else:
+            desired_name = "certificate.pdf"
+
+        # Reserve the name under a lock: other workers may want the same one
+        with self._path_lock:
+            desired_path = ensure_unique(
+                self.params.output_dir / safe_filename(desired_name), reserved=self._reserved_paths
+            )
+            self._reserved_paths.add(desired_path)
+
+        # Download & merge
+        self.status.emit(f"{prefix} Downloading PDF(s)…")
+        with tempfile.TemporaryDirectory() as td:
+            tdir = Path(td)
+
+            def fetch(i: int, pdf_url: str) -> Optional[Path]:
+                if i and self._stop:
+                    return None
+                # One subdir per part: attachments may share a file name
+                pdir = tdir / str(i)
+                pdir.mkdir()
+                label = f"{prefix} main" if i == 0 else f"{prefix} extra"
+                return self._download_to_temp(s, pdf_url, pdir, label)
+
+            # Main + extras in parallel; results come back in submission order
+            urls = [main_pdf] + extras
+            with ThreadPoolExecutor(max_workers=min(PDF_WORKERS, len(urls))) as pool:
+                results = list(pool.map(fetch, range(len(urls)), urls))
+
+            if not results[0]:
+                return True
+            parts: List[Path] = [p for p in results if p]
+
+            try:
+                if len(parts) == 1:
+                    # Temp dir is discarded anyway: move instead of copying bytes
+                    try:
+                        os.replace(parts[0], desired_path)
+                    except OSError:
+                        # Temp dir on another device; copy without loading into RAM
+                        shutil.copyfile(parts[0], desired_path)
+                    self.log.emit(f"{prefix} Saved: {desired_path.name}")
+                else:
+                    self.status.emit(f"{prefix} Merging {len(parts)} files…")
+                    merge_pdfs(parts, desired_path)
+                    self.log.emit(f"{prefix} Saved (merged {len(parts)}): {desired_path.name}")
+            except Exception as e:
+                self.log.emit(f"{prefix} ❌ Merge/save error: {e}")
+                return True
+            complete = len(parts) == 1 + len(extras)
+
+        # Only remember complete saves; a missing extra must be retried next run
+        etag, last_modified = r.headers.get("ETag"), r.headers.get("Last-Modified")
+        if complete and (etag or last_modified):
+            with self._path_lock:
+                self._etag_cache[url] = {
+                    "etag": etag,
+                    "last_modified": last_modified,
+                    "file": desired_path.name,
+                }
+
+        return True
+
+    def _download_to_temp(self, session: requests.Session, url: str, tdir: Path, label: str) -> Optional[Path]:
+        try:
+            with session.get(url, stream=True, allow_redirects=True, timeout=60) as r:
+                r.raise_for_status()
+                fname = url_filename_from_response(r, url)
+                out = tdir / (fname if fname.lower().endswith(".pdf") else f"{fname}.pdf")
+                # Copy the raw stream in C with 1 MiB buffers; still undo any
+                # Content-Encoding so the file on disk is the PDF itself
+                r.raw.decode_content = True
+                with open(out, "wb") as f:
+                    shutil.copyfileobj(r.raw, f, length=1024 * 1024)
             return out
         except requests.HTTPError as e:
             code = e.response.status_code if e.response is not None else "HTTP"
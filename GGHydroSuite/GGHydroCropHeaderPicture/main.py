@@ -1,10 +1,7 @@
 import sys
-from io import BytesIO
 from typing import Tuple
 
-from PIL import Image
-
-from PyQt6.QtCore import Qt, QBuffer, QByteArray
+from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QImage, QPixmap, QGuiApplication, QKeySequence
 from PyQt6.QtWidgets import QApplication, QLabel, QWidget, QVBoxLayout, QHBoxLayout, QSpinBox, QPushButton
 
@@ -20,31 +17,17 @@ HEADER_PX = 110
 # ============
 # Utilities
 # ============
-def crop_fixed_top(img: Image.Image, header_px: int) -> Tuple[Image.Image, int]:
-    """Crop a fixed number of pixels from the top of the image."""
-    w, h = img.size
+def crop_fixed_top_qimage(qimg: QImage, header_px: int) -> Tuple[QImage, int]:
+    """
+    Crop a fixed number of pixels from the top of the image.
+    QImage.copy allocates and copies the tail rows; it is not a view, but it
+    avoids any round-trip through PIL.
+    """
+    h = qimg.height()
     header_px = max(0, min(header_px, h - 1))  # keep safe bounds
     if header_px <= 0:
-        return img, 0
-    return img.crop((0, header_px, w, h)), header_px
-
-
-def qimage_to_pil(qimg: QImage) -> Image.Image:
-    """Convert QImage -> PIL Image using an in-memory buffer."""
-    ba = QByteArray()
-    buf = QBuffer(ba)
-    buf.open(QBuffer.OpenModeFlag.ReadWrite)
-    qimg.save(buf, b"PNG")
-    data = bytes(buf.data())
-    return Image.open(BytesIO(data)).convert("RGB")
-
-
-def pil_to_qimage(pil_img: Image.Image) -> QImage:
-    """Convert PIL Image -> QImage."""
-    bio = BytesIO()
-    pil_img.save(bio, format="PNG")
-    data = bio.getvalue()
-    return QImage.fromData(data, "PNG")
+        return qimg, 0
+    return qimg.copy(0, header_px, qimg.width(), h - header_px), header_px
 
 
 # ============
@@ -97,6 +80,14 @@ class CropPasteWindow(QWidget):
         self.setLayout(layout)
 
         self._current_qimage = None  # last processed image (QImage)
+        self._current_pix = None  # full-res pixmap of it, converted once per paste
+        self._last_label_size = None  # label size the preview was last scaled to
+
+        # Smooth rescale once a resize drag settles; fast scaling in between
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(30)
+        self._resize_timer.timeout.connect(self.rescale_preview)
 
     # Keyboard shortcuts
     def keyPressEvent(self, event):
@@ -110,8 +101,9 @@ class CropPasteWindow(QWidget):
     # Keep preview fitted on resize
     def resizeEvent(self, event):
         super().resizeEvent(event)
-        if self._current_qimage is not None:
-            self.show_qimage(self._current_qimage)
+        if self._current_pix is not None and self.image_label.size() != self._last_label_size:
+            self.rescale_preview(smooth=False)
+            self._resize_timer.start()
 
     # Handle image paste from clipboard
     def handle_paste(self):
@@ -124,15 +116,9 @@ class CropPasteWindow(QWidget):
                 self.info.setText("⚠️ Could not read image from clipboard.")
                 return
 
-            # QImage -> PIL
-            pil_img = qimage_to_pil(qimg)
-
-            # Fixed crop
+            # Fixed crop as a Qt-side copy of the QImage (no PIL conversions)
             header_px = int(self.spin_header.value())
-            cropped_pil, cropped_px = crop_fixed_top(pil_img, header_px)
-
-            # PIL -> QImage
-            out_qimg = pil_to_qimage(cropped_pil)
+            out_qimg, cropped_px = crop_fixed_top_qimage(qimg, header_px)
 
             # Display + info
             self._current_qimage = out_qimg
@@ -149,12 +135,18 @@ class CropPasteWindow(QWidget):
 
     # Render QImage into preview label (scaled)
     def show_qimage(self, qimg: QImage):
-        pix = QPixmap.fromImage(qimg)
-        scaled = pix.scaled(
-            self.image_label.width(),
-            self.image_label.height(),
+        self._current_pix = QPixmap.fromImage(qimg)
+        self.rescale_preview()
+
+    # Rescale the cached pixmap to the label (fast nearest-neighbour while dragging)
+    def rescale_preview(self, smooth: bool = True):
+        size = self.image_label.size()
+        self._last_label_size = size
+        scaled = self._current_pix.scaled(
+            size.width(),
+            size.height(),
             Qt.AspectRatioMode.KeepAspectRatio,
-            Qt.TransformationMode.SmoothTransformation
+            Qt.TransformationMode.SmoothTransformation if smooth else Qt.TransformationMode.FastTransformation
         )
         self.image_label.setPixmap(scaled)
 
@@ -1,30 +1,37 @@
 import sys
 import os
+import math
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+
 import numpy as np
 from scipy import signal
 from nptdms import TdmsFile
 
+try:
+    from numba import njit
+except ImportError:  # LAeq falls back to scipy.signal.sosfilt
+    njit = None
+
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QPushButton, QLabel, QFileDialog,
-    QHBoxLayout, QComboBox, QLineEdit, QMessageBox, QGroupBox
+    QHBoxLayout, QComboBox, QLineEdit, QMessageBox, QGroupBox, QProgressBar
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QObject, QThread, pyqtSignal
 
 P0 = 20e-6  # Reference sound pressure in Pa (20 µPa)
+# Filtering dtype: float32 is ample for 24-bit mic data and halves memory traffic;
+# sums of squares are still accumulated in float64
+LAEQ_DTYPE = np.float32
 
 
-def design_a_weighting_sos(fs: float):
+def _a_weighting_analog():
     """
-    Design an A-weighting filter (IEC 61672) using bilinear transform.
+    Analog A-weighting prototype H(s) = NUM/DEN (IEC 61672).
 
-    The implementation follows the widely used analog prototype with
-    the four A-weighting corner frequencies and the 1 kHz gain alignment.
-
-    Returns: Second-order sections (sos) for stable zero-phase filtering (with filtfilt).
+    Uses the widely used prototype with the four A-weighting corner
+    frequencies and the 1 kHz gain alignment. Independent of fs.
     """
-    if fs <= 0:
-        raise ValueError("Sampling frequency must be positive.")
-
     # Corner frequencies in Hz (IEC 61672)
     f1 = 20.598997
     f2 = 107.65265
@@ -39,7 +46,7 @@ def design_a_weighting_sos(fs: float):
     # DEN = (s + 2*pi*f4)^2 * (s + 2*pi*f1)^2 * (s + 2*pi*f3) * (s + 2*pi*f2)
     # plus a quadratic HF term is often expressed as [1, 4*pi*f4, (2*pi*f4)^2]; similar for f1
     pi = np.pi
-    NUM = [(2 * pi * f4) ** 2 * (10 ** (A1000 / 20.0)), 0.0, 0.0, 0.0, 0.0]
+    NUM = np.array([(2 * pi * f4) ** 2 * (10 ** (A1000 / 20.0)), 0.0, 0.0, 0.0, 0.0])
     DEN = np.polymul(
         [1.0, 4.0 * pi * f4, (2.0 * pi * f4) ** 2],
         np.polymul(
@@ -47,11 +54,58 @@ def design_a_weighting_sos(fs: float):
             np.polymul([1.0, 2.0 * pi * f3], [1.0, 2.0 * pi * f2])
         )
     )
+    return NUM, DEN
+
+
+# Only the bilinear transform depends on fs; build the prototype once
+_A_NUM_ANALOG, _A_DEN_ANALOG = _a_weighting_analog()
 
+
+@lru_cache(maxsize=16)
+def _a_weighting_sos_cached(fs: float) -> np.ndarray:
     # Bilinear transform to digital filter
-    b_z, a_z = signal.bilinear(NUM, DEN, fs=fs)
-    sos = signal.tf2sos(b_z, a_z)
-    return sos
+    b_z, a_z = signal.bilinear(_A_NUM_ANALOG, _A_DEN_ANALOG, fs=fs)
+    return np.ascontiguousarray(signal.tf2sos(b_z, a_z))
+
+
+def design_a_weighting_sos(fs: float):
+    """
+    Design an A-weighting filter (IEC 61672) using bilinear transform
+    of the precomputed analog prototype.
+
+    The design is cached per fs; each call returns its own copy, so a
+    caller modifying it can't affect later results.
+
+    Returns: Second-order sections (sos) for stable filtering (with sosfilt).
+    """
+    if fs <= 0:
+        raise ValueError("Sampling frequency must be positive.")
+    return _a_weighting_sos_cached(fs).copy()
+
+
+if njit is not None:
+    @njit(cache=True, fastmath=True, nogil=True)
+    def _laeq_kernel(x, sos, zi):
+        """
+        Fused biquad cascade (Direct-Form-II-Transposed, same state layout
+        as sosfilt's zi, updated in place) + sums, in one pass.
+        Returns (sum of y, sum of y^2).
+        """
+        n_sec = sos.shape[0]
+        s = 0.0
+        s2 = 0.0
+        for i in range(x.size):
+            y = x[i]
+            for k in range(n_sec):
+                out = sos[k, 0] * y + zi[k, 0]
+                zi[k, 0] = sos[k, 1] * y - sos[k, 4] * out + zi[k, 1]
+                zi[k, 1] = sos[k, 2] * y - sos[k, 5] * out
+                y = out
+            s += y
+            s2 += y * y
+        return s, s2
+else:
+    _laeq_kernel = None
 
 
 def compute_la_eq(pressure_pa: np.ndarray, fs: float) -> float:
@@ -62,27 +116,125 @@ def compute_la_eq(pressure_pa: np.ndarray, fs: float) -> float:
 
     Returns LAeq in dB(A).
     """
-    if pressure_pa.size == 0:
-        raise ValueError("Empty signal.")
-    if not np.isfinite(pressure_pa).all():
-        pressure_pa = np.nan_to_num(pressure_pa, nan=0.0, posinf=0.0, neginf=0.0)
+    # Same single pass as the streaming path: DC is handled by the filter
+    # (A-weighting has four zeros at DC; zi starts in steady state at the
+    # first sample) and by the sum/sum-of-squares variance, not a mean pass
+    return compute_la_eq_streaming(np.asarray(pressure_pa), fs)
 
-    # Remove any DC offset to avoid skewing RMS
-    x = pressure_pa - np.mean(pressure_pa)
 
-    # Design and apply A-weighting
-    sos = design_a_weighting_sos(fs)
-    # Zero-phase filtering to avoid phase distortion (requires enough samples)
-    x_a = signal.sosfiltfilt(sos, x)
+def linear_raw_scaling(ch):
+    """
+    (slope, intercept) if a TDMS channel stores raw integers behind a single
+    linear (or first-order polynomial) NI scale, else None.
+    """
+    props = getattr(ch, "properties", {}) or {}
+    if props.get("NI_Scaling_Status") != "unscaled":
+        return None
+    try:
+        if int(props.get("NI_Number_Of_Scales", 0)) != 1:
+            return None
+        scale_type = props.get("NI_Scale[0]_Scale_Type")
+        if scale_type == "Linear":
+            return (float(props["NI_Scale[0]_Linear_Slope"]),
+                    float(props.get("NI_Scale[0]_Linear_Y_Intercept", 0.0)))
+        if scale_type == "Polynomial":
+            n = int(props.get("NI_Scale[0]_Polynomial_Coefficients_Size", 0))
+            if n in (1, 2):
+                c0 = float(props["NI_Scale[0]_Polynomial_Coefficients[0]"])
+                c1 = float(props["NI_Scale[0]_Polynomial_Coefficients[1]"]) if n == 2 else 0.0
+                return c1, c0
+    except (KeyError, TypeError, ValueError):
+        pass
+    return None
+
+
+def compute_la_eq_streaming(channel, fs: float, block: int = 1 << 20, progress_cb=None) -> float:
+    """
+    Compute LAeq over a TDMS channel without loading it whole.
+    channel: nptdms channel (anything supporting len() and [start:stop])
+    fs: sampling rate in Hz
+    block: samples read per step
+    progress_cb: optional callable(fraction 0..1), called after each block;
+                 raising from it (e.g. LAeqCancelled) aborts the computation
 
-    # RMS of A-weighted pressure
-    p_rms_a = np.sqrt(np.mean(x_a ** 2))
-    if p_rms_a <= 0:
+    Streams blocks through a stateful sosfilt and accumulates sum and
+    sum of squares; the DC-removed mean square is sum_sq/n - (sum/n)^2.
+    Returns LAeq in dB(A).
+
+    The A-weighting is applied once, per IEC 61672. Versions that used
+    sosfiltfilt applied it twice (|H|^2), so their LAeq was too low for
+    low-frequency content: for a pure tone, by another ~19 dB at 100 Hz and
+    ~30 dB at 50 Hz. White-noise results differ by well under 1 dB.
+    """
+    n_total = len(channel)
+    if n_total == 0:
+        raise ValueError("Empty signal.")
+
+    sos = design_a_weighting_sos(fs)
+    if _laeq_kernel is None:
+        sos = sos.astype(LAEQ_DTYPE)
+    zi = None
+    sum_x = 0.0
+    sum_sq = 0.0
+    n = 0
+    # One scratch block per call (not module-level: "Compute all" runs on threads)
+    scratch = np.empty(min(block, n_total), dtype=LAEQ_DTYPE)
+    # Raw integer channels: read the ints and scale into the float32 scratch in
+    # one pass, instead of letting nptdms build a float64 block first
+    scaling = linear_raw_scaling(channel) if hasattr(channel, "read_data") else None
+    for start in range(0, n_total, block):
+        raw = None
+        if scaling is not None:
+            raw = channel.read_data(start, block, scaled=False)
+            if isinstance(raw, dict):
+                # DAQmx raw data: only a single scaler maps onto one linear scale
+                raw = next(iter(raw.values())) if len(raw) == 1 else None
+            if raw is None:
+                scaling = None
+        if raw is not None:
+            x = scratch[:len(raw)]
+            np.multiply(raw, scaling[0], out=x, casting="unsafe")
+            if scaling[1]:
+                x += LAEQ_DTYPE(scaling[1])
+        else:
+            raw = channel[start:start + block]
+            x = scratch[:len(raw)]
+            np.copyto(x, raw, casting="unsafe")
+        if not np.isfinite(x).all():
+            np.nan_to_num(x, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
+        if zi is None:
+            # Start in steady state for the initial level (the filter blocks DC)
+            zi = signal.sosfilt_zi(sos) * x[0]
+            zi = np.ascontiguousarray(zi, dtype=np.float64 if _laeq_kernel is not None else LAEQ_DTYPE)
+        if _laeq_kernel is not None:
+            s1, s2 = _laeq_kernel(x, sos, zi)
+            sum_x += s1
+            sum_sq += s2
+        else:
+            y, zi = signal.sosfilt(sos, x, zi=zi)
+            sum_x += float(y.sum(dtype=np.float64))
+            sum_sq += float(np.einsum("i,i->", y, y, dtype=np.float64))
+        n += x.size
+        if progress_cb is not None:
+            progress_cb(n / n_total)
+
+    mean = sum_x / n
+    ms = sum_sq / n - mean * mean
+    if ms <= 0:
         # If everything is silence or numeric underflow
         return -np.inf
 
-    laeq = 20.0 * np.log10(p_rms_a / P0)
-    return laeq
+    return 10.0 * math.log10(ms / (P0 * P0))
+
+
+def compute_la_eq_for_channel(path: str, group_name: str, channel_name: str, fs: float,
+                              progress_cb=None) -> float:
+    """
+    Streaming LAeq of one channel through its own file handle, so several
+    can run on worker threads without sharing a file position.
+    """
+    with TdmsFile.open(path) as f:
+        return compute_la_eq_streaming(f[group_name][channel_name], fs, progress_cb=progress_cb)
 
 
 def try_get_sampling_rate_from_tdms_channel(ch):
@@ -116,6 +268,98 @@ def try_get_sampling_rate_from_tdms_channel(ch):
     return None
 
 
+class LAeqCancelled(Exception):
+    """Raised from a progress callback to abort a streaming LAeq computation."""
+
+
+class CancellableWorker(QObject):
+    """Base for the LAeq workers: cancel() stops run() at the next block."""
+
+    def __init__(self):
+        super().__init__()
+        self._cancelled = False
+
+    def cancel(self):
+        # Called from the GUI thread; a plain flag is enough for a one-way stop
+        self._cancelled = True
+
+    def check_cancelled(self, frac: float = 0.0):
+        if self._cancelled:
+            raise LAeqCancelled()
+
+
+class LAeqWorker(CancellableWorker):
+    """Computes one channel's LAeq on a QThread (moveToThread + run)."""
+    progress = pyqtSignal(int)      # 0..100
+    finished = pyqtSignal(float)    # LAeq in dB(A), -inf if not computable
+    error = pyqtSignal(str)
+
+    def __init__(self, path: str, group_name: str, channel_name: str, fs: float):
+        super().__init__()
+        self.path = path
+        self.group_name = group_name
+        self.channel_name = channel_name
+        self.fs = fs
+
+    def run(self):
+        try:
+            laeq = compute_la_eq_for_channel(
+                self.path, self.group_name, self.channel_name, self.fs,
+                progress_cb=self.on_block,
+            )
+            self.finished.emit(float(laeq))
+        except LAeqCancelled:
+            pass
+        except Exception as e:
+            self.error.emit(str(e))
+
+    def on_block(self, frac: float):
+        self.check_cancelled()
+        self.progress.emit(int(frac * 100))
+
+
+class LAeqAllWorker(CancellableWorker):
+    """Computes LAeq for several channels of one group on a QThread, via a thread pool."""
+    progress = pyqtSignal(int)              # 0..100, by channels completed
+    channel_done = pyqtSignal(str, str)     # channel name, result text
+    finished = pyqtSignal()
+    error = pyqtSignal(str)
+
+    def __init__(self, path: str, group_name: str, jobs: list):
+        super().__init__()
+        self.path = path
+        self.group_name = group_name
+        self.jobs = jobs  # [(channel name, fs)]
+
+    def run(self):
+        try:
+            # SciPy's filter loop (and the numba kernel) release the GIL, so
+            # threads scale across cores
+            workers = min(os.cpu_count() or 1, len(self.jobs))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = {
+                    pool.submit(compute_la_eq_for_channel, self.path, self.group_name, name, fs,
+                                self.check_cancelled): name
+                    for name, fs in self.jobs
+                }
+                for done, fut in enumerate(as_completed(futures), 1):
+                    if self._cancelled:
+                        # Running channels stop at their next block
+                        for f in futures:
+                            f.cancel()
+                        return
+                    try:
+                        laeq = fut.result()
+                        text = f"{laeq:.2f} dB(A)" if np.isfinite(laeq) else "silence or invalid data"
+                    except Exception as e:
+                        text = f"error: {e}"
+                    self.channel_done.emit(futures[fut], text)
+                    self.progress.emit(int(done * 100 / len(futures)))
+            self.finished.emit()
+        except Exception as e:
+            self.error.emit(str(e))
+
+
 class TDMSAWeightingApp(QWidget):
     def __init__(self):
         super().__init__()
@@ -124,8 +368,13 @@ class TDMSAWeightingApp(QWidget):
         self.tdms = None
         self.groups = []
         self.channels = []
+        self._group_channels = {}  # group name -> channel list, built once per file
         self.current_group = None
         self.current_channel = None
+        self._thread = None
+        self._worker = None
+        self._all_group = None
+        self._all_results = {}  # channel name -> result text for "Compute all"
 
         self.build_ui()
 
@@ -172,6 +421,15 @@ class TDMSAWeightingApp(QWidget):
         self.btn_compute.clicked.connect(self.on_compute)
         layout.addWidget(self.btn_compute)
 
+        self.btn_compute_all = QPushButton("Compute all channels")
+        self.btn_compute_all.clicked.connect(self.on_compute_all)
+        layout.addWidget(self.btn_compute_all)
+
+        self.progress = QProgressBar()
+        self.progress.setRange(0, 100)
+        self.progress.setValue(0)
+        layout.addWidget(self.progress)
+
         # Result
         self.result_label = QLabel("Result: —")
         self.result_label.setAlignment(Qt.AlignmentFlag.AlignLeft)
@@ -199,17 +457,20 @@ class TDMSAWeightingApp(QWidget):
 
     def load_tdms(self, path: str):
         try:
-            t = TdmsFile.read(path)
+            # Metadata only; channel data is read from disk when computing
+            t = TdmsFile.open(path)
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to read TDMS:\n{e}")
             return
 
+        self.close_tdms()
         self.tdms = t
         self.tdms_path = path
         self.file_label.setText(os.path.basename(path))
 
         # Populate groups and channels
         groups = t.groups()
+        self._group_channels = {g.name: list(g.channels()) for g in groups}
         self.group_combo.clear()
         self.channel_combo.clear()
         self.groups = groups
@@ -222,13 +483,27 @@ class TDMSAWeightingApp(QWidget):
             self.populate_channels_for_group(groups[0])
 
         # If only one group/channel, auto-select
-        if len(groups) == 1 and len(groups[0].channels()) == 1:
-            ch = groups[0].channels()[0]
+        if len(groups) == 1 and len(self._group_channels[groups[0].name]) == 1:
+            ch = self._group_channels[groups[0].name][0]
             self.try_autofill_fs_from_channel(ch)
 
+    def close_tdms(self):
+        if self.tdms is not None:
+            self.tdms.close()
+            self.tdms = None
+
+    def closeEvent(self, event):
+        # Stop a running computation at its next block, then wait for the thread
+        if self._thread is not None:
+            self._worker.cancel()
+            self._thread.quit()
+            self._thread.wait()
+        self.close_tdms()
+        super().closeEvent(event)
+
     def populate_channels_for_group(self, group):
         self.channel_combo.clear()
-        self.channels = group.channels()
+        self.channels = self._group_channels.get(group.name, [])
         for ch in self.channels:
             self.channel_combo.addItem(ch.name)
         # Try to auto-fill fs from first channel
@@ -249,7 +524,7 @@ class TDMSAWeightingApp(QWidget):
         if gi < 0 or ci < 0 or gi >= len(self.groups):
             return None
         group = self.groups[gi]
-        chs = group.channels()
+        chs = self._group_channels.get(group.name, [])
         if ci >= len(chs):
             return None
         return chs[ci]
@@ -292,22 +567,105 @@ class TDMSAWeightingApp(QWidget):
             QMessageBox.warning(self, "Invalid fs", "Sampling rate must be positive.")
             return
 
-        try:
-            # Read data as numpy array
-            data = ch[:]
-            # Ensure float64 for numeric stability
-            data = np.asarray(data, dtype=np.float64)
-
-            laeq = compute_la_eq(data, fs)
-            if not np.isfinite(laeq):
-                display = "Result: LAeq could not be computed (silence or invalid data)."
+        # Stream the channel block by block on a worker thread; the window stays responsive
+        group = self.groups[self.group_combo.currentIndex()]
+        worker = LAeqWorker(self.tdms_path, group.name, ch.name, fs)
+        worker.finished.connect(self.on_compute_finished)
+        self.result_label.setText("Result: computing…")
+        self.start_worker(worker)
+
+    def start_worker(self, worker):
+        """Run a worker (run/progress/finished/error) on its own QThread."""
+        self._thread = QThread()
+        self._worker = worker
+        worker.moveToThread(self._thread)
+
+        self._thread.started.connect(worker.run)
+        worker.progress.connect(self.progress.setValue)
+        worker.error.connect(self.on_compute_error)
+        worker.finished.connect(self._thread.quit)
+        worker.error.connect(self._thread.quit)
+        self._thread.finished.connect(worker.deleteLater)
+        self._thread.finished.connect(self._thread.deleteLater)
+        self._thread.finished.connect(self.on_compute_done)
+
+        self.set_compute_enabled(False)
+        self.progress.setValue(0)
+        self._thread.start()
+
+    def on_compute_finished(self, laeq: float):
+        if not np.isfinite(laeq):
+            display = "Result: LAeq could not be computed (silence or invalid data)."
+        else:
+            display = f"Result: LAeq = {laeq:.2f} dB(A)"
+        self.result_label.setText(display)
+
+    def on_compute_error(self, msg: str):
+        self.result_label.setText("Result: —")
+        QMessageBox.critical(self, "Computation Error", f"Failed to compute LAeq:\n{msg}")
+
+    def on_compute_done(self):
+        self._thread = None
+        self._worker = None
+        self.set_compute_enabled(True)
+
+    def set_compute_enabled(self, enabled: bool):
+        self.btn_compute.setEnabled(enabled)
+        self.btn_compute_all.setEnabled(enabled)
+        self.btn_browse.setEnabled(enabled)
+
+    def on_compute_all(self):
+        if self.tdms is None:
+            QMessageBox.warning(self, "No File", "Please select a TDMS file first.")
+            return
+
+        gi = self.group_combo.currentIndex()
+        if gi < 0 or gi >= len(self.groups) or not self.channels:
+            QMessageBox.warning(self, "No Channel", "The selected group has no channels.")
+            return
+        group = self.groups[gi]
+
+        # Each channel's own fs property wins; the box (which is auto-filled from
+        # the first/selected channel) only covers channels without one
+        fs_text = self.fs_edit.text().strip()
+        manual_fs = None
+        if fs_text:
+            try:
+                manual_fs = float(fs_text)
+            except Exception:
+                QMessageBox.warning(self, "Invalid fs", "Sampling rate must be a number (Hz).")
+                return
+            if manual_fs <= 0:
+                QMessageBox.warning(self, "Invalid fs", "Sampling rate must be positive.")
+                return
+
+        # One line per channel, in channel order, filled in as results arrive
+        self._all_group = group.name
+        self._all_results = {}
+        jobs = []
+        for ch in self.channels:
+            fs = try_get_sampling_rate_from_tdms_channel(ch) or manual_fs
+            if fs is None or fs <= 0:
+                self._all_results[ch.name] = "fs not found"
             else:
-                display = f"Result: LAeq = {laeq:.2f} dB(A)"
+                self._all_results[ch.name] = "computing…"
+                jobs.append((ch.name, fs))
+        self.show_all_results()
+        if not jobs:
+            return
 
-            self.result_label.setText(display)
+        worker = LAeqAllWorker(self.tdms_path, group.name, jobs)
+        worker.channel_done.connect(self.on_channel_done)
+        self.start_worker(worker)
 
-        except Exception as e:
-            QMessageBox.critical(self, "Computation Error", f"Failed to compute LAeq:\n{e}")
+    def on_channel_done(self, name: str, text: str):
+        self._all_results[name] = text
+        self.show_all_results()
+
+    def show_all_results(self):
+        lines = [f"Result ({self._all_group}):"]
+        lines += [f"  {name}: {text}" for name, text in self._all_results.items()]
+        self.result_label.setText("\n".join(lines))
 
 
 def main():
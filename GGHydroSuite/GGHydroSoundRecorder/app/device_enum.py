@@ -0,0 +1,26 @@
+from PySide6.QtCore import QObject, QRunnable, Signal
+from nidaqmx.system import System
+
+
+class DeviceEnumSignals(QObject):
+    finished = Signal(object)   # dict[str, list[str]]: device -> AI physical channels
+    error = Signal(str)
+
+
+class DeviceEnumTask(QRunnable):
+    """
+    Enumerates NI devices and their AI physical channels off the GUI thread.
+    QRunnable is not a QObject, so signals live on a DeviceEnumSignals holder.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.signals = DeviceEnumSignals()
+
+    def run(self):
+        try:
+            system = System.local()
+            device_chans = {d.name: [ch.name for ch in d.ai_physical_chans] for d in system.devices}
+            self.signals.finished.emit(device_chans)
+        except Exception as e:
+            self.signals.error.emit(str(e))
@@ -1,21 +1,20 @@
 import threading
-import time
 from pathlib import Path
 
-from PySide6.QtCore import Qt, QThread, QTimer, QSettings
+from PySide6.QtCore import Qt, QTimer, QSettings, QThreadPool
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QGridLayout, QHBoxLayout, QGroupBox,
     QLabel, QLineEdit, QComboBox, QDoubleSpinBox, QPushButton, QFileDialog,
     QProgressBar, QMessageBox
 )
 
-from nidaqmx.system import System
 from nidaqmx.constants import LoggingOperation
 
+from .device_enum import DeviceEnumTask
 from .models import MicConfig, RecordMeta
 from .recorder_worker import RecorderWorker
 from .ni_recorder import SAMPLE_RATE
-from .utils import sanitize_token, build_tdms_filename, ensure_dir, increment_path
+from .utils import build_record_path, ensure_dir, increment_path
 
 
 class MainWindow(QMainWindow):
@@ -26,11 +25,28 @@ class MainWindow(QMainWindow):
 
         # Global app settings (remember last choices)
         self.settings = QSettings("MachineAudioSampler", "RecorderApp")
+        # Last-used choices only: skip the temp-file + rename dance on sync.
+        self.settings.setAtomicSyncRequired(False)
 
         self.stop_event = threading.Event()
-        self.thread = None
+        # One long-lived recorder thread reused across recordings
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._pool.setExpiryTimeout(-1)
         self.worker = None
-        self.started_at = None
+        self._last_pb = -1    # last value pushed to the progress bar
+        self._busy = False  # True from Start click until the worker reports back
+        self._device_chans: dict[str, list[str]] = {}  # NI device -> AI physical channels
+        self._enum_task = None
+        self._mkdir_cache: set[Path] = set()  # folders already ensured this session
+        # Values already in QSettings (seeded from the store, so the first Start
+        # of a session only writes what actually changed)
+        self._saved_settings: dict = {}
+        for key in ("project", "unit", "sens", "mic_id", "duration",
+                    "last_state", "last_location", "ni_channel", "storage_path"):
+            if self.settings.contains(key):
+                value = self.settings.value(key)
+                self._saved_settings[key] = float(value) if key in ("sens", "duration") else str(value)
 
         root = QWidget()
         self.setCentralWidget(root)
@@ -45,7 +61,11 @@ class MainWindow(QMainWindow):
 
         gl_mic.addWidget(QLabel("NI Device:"), 0, 0)
         self.cb_device = QComboBox()
-        gl_mic.addWidget(self.cb_device, 0, 1)
+        self.btn_refresh_devices = QPushButton("Refresh")
+        row_device = QHBoxLayout()
+        row_device.addWidget(self.cb_device, 1)
+        row_device.addWidget(self.btn_refresh_devices)
+        gl_mic.addLayout(row_device, 0, 1)
 
         gl_mic.addWidget(QLabel("Channel:"), 1, 0)
         self.cb_channel = QComboBox()
@@ -140,59 +160,66 @@ class MainWindow(QMainWindow):
 
         # Signals / Timers
         self.btn_browse.clicked.connect(self._browse_path)
+        self.btn_refresh_devices.clicked.connect(self.refresh_devices)
         self.btn_start.clicked.connect(self.start_recording)
         self.btn_stop.clicked.connect(self.stop_recording)
 
-        self.ui_timer = QTimer(self)
-        self.ui_timer.setInterval(50)
-        self.ui_timer.timeout.connect(self._tick)
-
         self.refresh_devices()
-        self.cb_device.currentTextChanged.connect(self.refresh_channels)
+
+        # Coalesce bursts of device changes (e.g. mouse-wheel scrubbing)
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(50)
+        self._refresh_timer.timeout.connect(lambda: self.refresh_channels(self.cb_device.currentText()))
+        self.cb_device.currentTextChanged.connect(lambda _: self._refresh_timer.start())
 
     # -------------------------
     # Device discovery
     # -------------------------
     def refresh_devices(self):
-        self.cb_device.clear()
+        # DAQmx enumeration can take hundreds of ms on a cDAQ chassis; run it
+        # on the global pool so the window paints immediately.
+        self.btn_refresh_devices.setEnabled(False)
+        self._set_device_items(["(scanning…)"])
         self.cb_channel.clear()
-        try:
-            system = System.local()
-            devices = list(system.devices)
-            if not devices:
-                self.cb_device.addItem("(no NI devices found)")
-                self.cb_channel.addItem("(none)")
-                return
-
-            for d in devices:
-                self.cb_device.addItem(d.name)
-
-            self.refresh_channels(self.cb_device.currentText())
-
-            # restore last used channel if present
-            saved_channel = self.settings.value("ni_channel", "")
-            if saved_channel:
-                idx = self.cb_channel.findText(saved_channel)
-                if idx >= 0:
-                    self.cb_channel.setCurrentIndex(idx)
-
-        except Exception as e:
-            self.cb_device.addItem(f"(error: {e})")
-            self.cb_channel.addItem("(none)")
+        self.cb_channel.addItem("(scanning…)")
+
+        self._enum_task = DeviceEnumTask()
+        self._enum_task.setAutoDelete(False)  # kept alive by self._enum_task
+        self._enum_task.signals.finished.connect(self._on_devices_enumerated)
+        self._enum_task.signals.error.connect(self._on_devices_error)
+        QThreadPool.globalInstance().start(self._enum_task)
+
+    def _on_devices_enumerated(self, device_chans: dict):
+        self.btn_refresh_devices.setEnabled(True)
+        self._device_chans = device_chans
+        self._set_device_items(list(device_chans) or ["(no NI devices found)"])
+
+        # restore last used channel if present
+        saved_channel = self.settings.value("ni_channel", "")
+        if saved_channel:
+            idx = self.cb_channel.findText(saved_channel)
+            if idx >= 0:
+                self.cb_channel.setCurrentIndex(idx)
+
+    def _on_devices_error(self, msg: str):
+        self.btn_refresh_devices.setEnabled(True)
+        self._device_chans = {}
+        self._set_device_items([f"(error: {msg})"])
+
+    def _set_device_items(self, items: list[str]):
+        self.cb_device.blockSignals(True)
+        self.cb_device.clear()
+        self.cb_device.addItems(items)
+        self.cb_device.blockSignals(False)
+        self.refresh_channels(self.cb_device.currentText())
 
     def refresh_channels(self, dev_name: str):
         self.cb_channel.clear()
         if not dev_name or dev_name.startswith("("):
             self.cb_channel.addItem("(none)")
             return
-
-        try:
-            system = System.local()
-            dev = system.devices[dev_name]
-            for ch in dev.ai_physical_chans:
-                self.cb_channel.addItem(ch.name)
-        except Exception as e:
-            self.cb_channel.addItem(f"(error: {e})")
+        self.cb_channel.addItems(self._device_chans.get(dev_name) or ["(none)"])
 
     # -------------------------
     # Recording
@@ -203,12 +230,35 @@ class MainWindow(QMainWindow):
             self.le_path.setText(folder)
 
     def start_recording(self):
+        # Guard against re-entry (double-click, or clicks queued while one of
+        # the modal prompts below spins a nested event loop).
+        if self._busy:
+            return
+        self._busy = True
+        started = False
+        try:
+            started = self._start_recording()
+        except Exception as e:
+            # e.g. PermissionError from increment_path/_ensure_dir; undo the UI state
+            self.pb.setValue(0)
+            self.btn_start.setEnabled(True)
+            self.btn_stop.setEnabled(False)
+            self._set_status(f"Error: {e}")
+            self._error("Cannot start recording", str(e))
+        finally:
+            # Only a worker handed to the pool clears this, via _on_finished/_on_error
+            if not started:
+                self._busy = False
+
+    def _start_recording(self) -> bool:
         project = self.le_project.text().strip()
         unit = self.le_unit.text().strip()
         state = self.le_state.text().strip()
         loc = self.le_location.text().strip()
         duration = float(self.sb_duration.value())
         storage = self.le_path.text().strip()
+        sens = float(self.sb_sens.value())
+        mic_id = self.le_mic_id.text().strip()
 
         if not project:
             return self._error("Missing info", "Project Name is required.")
@@ -223,16 +273,26 @@ class MainWindow(QMainWindow):
         if not ch or ch.startswith("("):
             return self._error("Missing info", "Select a valid NI channel (e.g., cDAQ1Mod1/ai0).")
 
-        # Persist (global) settings
-        self.settings.setValue("project", project)
-        self.settings.setValue("unit", unit)
-        self.settings.setValue("sens", float(self.sb_sens.value()))
-        self.settings.setValue("mic_id", self.le_mic_id.text().strip())
-        self.settings.setValue("duration", duration)
-        self.settings.setValue("last_state", state)
-        self.settings.setValue("last_location", loc)
-        self.settings.setValue("ni_channel", ch)
-        self.settings.setValue("storage_path", storage)
+        # Persist (global) settings: skip unchanged keys, one flush for the batch
+        values = {
+            "project": project,
+            "unit": unit,
+            "sens": sens,
+            "mic_id": mic_id,
+            "duration": duration,
+            "last_state": state,
+            "last_location": loc,
+            "ni_channel": ch,
+            "storage_path": storage,
+        }
+        dirty = False
+        for key, value in values.items():
+            if self._saved_settings.get(key) != value:
+                self.settings.setValue(key, value)
+                self._saved_settings[key] = value
+                dirty = True
+        if dirty:
+            self.settings.sync()
 
         # Ensure storage path exists
         base_dir = Path(storage).expanduser().resolve()
@@ -245,16 +305,8 @@ class MainWindow(QMainWindow):
                 return self._error("Cannot create folder", f"{base_dir}\n\n{e}")
 
         # Build filename in the EXACT storage folder (no subfolders)
-        proj_tok = sanitize_token(project)
-        unit_tok = sanitize_token(unit)
-        state_tok = sanitize_token(state)
-        loc_tok = sanitize_token(loc)
-
-        out_dir = base_dir                               # <-- changed: direct storage path
-        ensure_dir(out_dir)
-
-        filename = build_tdms_filename(proj_tok, unit_tok, state_tok, loc_tok)
-        tdms_path = out_dir / filename
+        out_dir, tdms_path = build_record_path(base_dir, project, unit, state, loc)
+        self._ensure_dir(out_dir)
 
         # File exists? Ask Increment / Overwrite / Cancel
         logging_operation = LoggingOperation.CREATE_OR_REPLACE
@@ -269,8 +321,8 @@ class MainWindow(QMainWindow):
 
         mic_cfg = MicConfig(
             physical_channel=ch,
-            sensitivity_mV_per_Pa=float(self.sb_sens.value()),
-            microphone_id=self.le_mic_id.text().strip(),
+            sensitivity_mV_per_Pa=sens,
+            microphone_id=mic_id,
         )
         meta = RecordMeta(
             project=project, unit=unit, unit_state=state, location=loc, duration_s=duration
@@ -282,13 +334,12 @@ class MainWindow(QMainWindow):
         self.btn_start.setEnabled(False)
         self.btn_stop.setEnabled(True)
         self._set_status("Recording")
-        self.started_at = time.time()
+        self._last_pb = 0
         self.pb.setValue(0)
         self.lbl_elapsed.setText("Elapsed: 0.0 s")
-        self.ui_timer.start()
 
-        # Worker thread
-        self.thread = QThread()
+        # Worker: only blocks inside DAQmx. Signals emitted from the pool thread
+        # are queued to the GUI thread by Qt.
         self.worker = RecorderWorker(
             mic_cfg=mic_cfg,
             record_meta=meta,
@@ -296,26 +347,29 @@ class MainWindow(QMainWindow):
             tdms_path=tdms_path,
             logging_operation=logging_operation,
         )
-        self.worker.moveToThread(self.thread)
-
-        self.thread.started.connect(self.worker.run)
-        self.worker.status.connect(self._set_status)
-        self.worker.finished.connect(self._on_finished)
-        self.worker.error.connect(self._on_error)
+        self.worker.setAutoDelete(False)  # kept alive by self.worker
+        self.worker.signals.status.connect(self._set_status)
+        self.worker.signals.progress.connect(self._on_progress)
+        self.worker.signals.finished.connect(self._on_finished)
+        self.worker.signals.error.connect(self._on_error)
 
-        self.worker.finished.connect(self.thread.quit)
-        self.worker.finished.connect(self.worker.deleteLater)
-        self.thread.finished.connect(self.thread.deleteLater)
-
-        self.worker.error.connect(self.thread.quit)
-        self.worker.error.connect(self.worker.deleteLater)
-
-        self.thread.start()
+        self._pool.start(self.worker)
+        return True
 
     def stop_recording(self):
         self.stop_event.set()
         self._set_status("Stopping...")
 
+    def closeEvent(self, event):
+        # The pool waits for its running task on teardown; end it early.
+        self.stop_event.set()
+        super().closeEvent(event)
+
+    def _ensure_dir(self, p: Path):
+        if p not in self._mkdir_cache:
+            ensure_dir(p)
+            self._mkdir_cache.add(p)
+
     # -------------------------
     # UI helpers
     # -------------------------
@@ -348,8 +402,7 @@ class MainWindow(QMainWindow):
         return "cancel"
 
     def _on_finished(self, result):
-        self.ui_timer.stop()
-        self.started_at = None
+        self._busy = False
         self.pb.setValue(1000)
         self._set_status("Idle")
         self.btn_start.setEnabled(True)
@@ -357,22 +410,20 @@ class MainWindow(QMainWindow):
         # No table; nothing else to show after recording.
 
     def _on_error(self, msg: str):
-        self.ui_timer.stop()
-        self.started_at = None
+        self._busy = False
         self.pb.setValue(0)
         self._set_status("Idle")
         self.btn_start.setEnabled(True)
         self.btn_stop.setEnabled(False)
         self._error("Recording failed", msg)
 
-    def _tick(self):
-        if self.started_at is None:
-            return
-        elapsed = time.time() - self.started_at
-        dur = float(self.sb_duration.value())
+    def _on_progress(self, elapsed: float, frac: float):
+        # Driven by the worker (~10 Hz while recording); nothing runs when idle
         self.lbl_elapsed.setText(f"Elapsed: {elapsed:.1f} s")
-        if dur > 0:
-            self.pb.setValue(int(min(1.0, elapsed / dur) * 1000))
+        v = int(frac * 1000)
+        if v != self._last_pb:
+            self._last_pb = v
+            self.pb.setValue(v)
 
     def _set_status(self, text: str):
         self.lbl_status.setText(text)
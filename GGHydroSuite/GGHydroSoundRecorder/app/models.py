@@ -1,12 +1,12 @@
 from dataclasses import dataclass
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MicConfig:
     physical_channel: str            # e.g. "cDAQ1Mod1/ai0"
     sensitivity_mV_per_Pa: float     # e.g. 45.60
     microphone_id: str = ""          # optional label
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RecordMeta:
     project: str
     unit: str
@@ -14,7 +14,7 @@ class RecordMeta:
     location: str
     duration_s: float
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RecordResult:
     tdms_path: str
     duration_s: float
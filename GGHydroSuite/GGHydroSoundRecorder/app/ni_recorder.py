@@ -3,6 +3,8 @@ import time
 from pathlib import Path
 
 import nidaqmx
+from nidaqmx.errors import DaqError
+from nidaqmx.error_codes import DAQmxErrors
 from nidaqmx.constants import (
     AcquisitionType,
     TerminalConfiguration,
@@ -14,11 +16,22 @@ from nidaqmx.constants import (
 )
 
 SAMPLE_RATE = 51200  # Hz
+BUF_ALIGN_SAMPLES = 4096  # keep the driver buffer a multiple of sector-sized file writes
+# per channel, >= 2 s of data rounded up to a power of two (131072 = 2.56 s).
+# Deliberately larger than next_pow2(SAMPLE_RATE // 5) = 16384 (0.32 s): USB
+# cDAQ transfers and disk stalls in LOG mode need more slack than that
+INPUT_BUF_SAMPLES = max(BUF_ALIGN_SAMPLES, 1 << (SAMPLE_RATE * 2 - 1).bit_length())
+DONE_TIMEOUT_MARGIN_S = 10.0  # slack for task start latency on wait_until_done
+PROGRESS_INTERVAL_S = 0.1  # progress callback rate while recording
+TAIL_POLL_S = 0.01  # done-check interval once the expected duration has elapsed
+
+_K = 20.0 / math.log(10.0)  # 20*log10(x) == _K*ln(x)
+_INV_PREF = 1.0 / 20e-6
 
 def pa_to_db_spl(p_pa: float, pref: float = 20e-6) -> float:
     """Convert Pascals to dB SPL re 20 µPa."""
-    p_pa = max(float(p_pa), 1e-12)
-    return 20.0 * math.log10(p_pa / pref)
+    inv_pref = _INV_PREF if pref == 20e-6 else 1.0 / pref
+    return _K * math.log(max(float(p_pa), 1e-12) * inv_pref)
 
 def estimate_max_spl_db(max_input_volts: float, sensitivity_mV_per_Pa: float) -> float:
     """
@@ -37,12 +50,15 @@ def record_microphone_to_tdms(
     sensitivity_mV_per_Pa: float,
     duration_s: float,
     stop_event=None,
+    progress_cb=None,
     group_name: str = "RawRecord",
     max_input_volts_for_estimate: float = 5.0,
     logging_operation: LoggingOperation = LoggingOperation.CREATE_OR_REPLACE,
 ) -> float:
     """
     Records finite samples at 51200 Hz and logs directly to TDMS (native DAQmx logging).
+    progress_cb(elapsed_s, fraction) is called every PROGRESS_INTERVAL_S, with the
+    fraction taken from the samples the driver has actually acquired.
     Returns actual elapsed seconds.
     """
     total_samples = int(round(SAMPLE_RATE * float(duration_s)))
@@ -72,6 +88,15 @@ def record_microphone_to_tdms(
             samps_per_chan=total_samples,
         )
 
+        # samps_per_chan would otherwise size the driver buffer for the whole
+        # recording; 2.56 s (INPUT_BUF_SAMPLES) is plenty for LOG mode streaming
+        # to disk. In LOG mode the buffer must divide evenly into the logging
+        # file write size, hence the power of two. (For finite tasks DAQmx
+        # already pre-allocates the TDMS file for samps_per_chan, so no
+        # fallocate is needed.)
+        if total_samples > INPUT_BUF_SAMPLES:
+            task.in_stream.input_buf_size = INPUT_BUF_SAMPLES
+
         # Native TDMS logging (best perf in LOG mode; cannot read while logging)
         task.in_stream.configure_logging(
             str(tdms_path),
@@ -81,19 +106,43 @@ def record_microphone_to_tdms(
         )
 
         task.start()
-        t0 = time.time()
+        t0 = time.monotonic_ns()
 
+        # DAQmx streams to disk on its own; wake up only to report progress
+        # and to notice a stop request or the end of the acquisition.
+        deadline_s = float(duration_s) + DONE_TIMEOUT_MARGIN_S
+        stopped = False
         while True:
-            if stop_event is not None and stop_event.is_set():
-                try:
-                    task.stop()
-                finally:
-                    pass
-
-            if task.is_task_done():
+            elapsed = (time.monotonic_ns() - t0) / 1e9
+            if elapsed >= deadline_s:
                 break
+            if stop_event is not None:
+                # Event.wait returns as soon as Stop is pressed; near the end,
+                # wake at the expected finish instead of a full interval later
+                remaining = float(duration_s) - elapsed
+                timeout = min(PROGRESS_INTERVAL_S, remaining) if remaining > TAIL_POLL_S else TAIL_POLL_S
+                if stop_event.wait(timeout):
+                    stopped = True
+                    break
+                if task.is_task_done():
+                    break
+            else:
+                # Nothing to stop us: block in the driver, which returns on done
+                try:
+                    task.wait_until_done(timeout=PROGRESS_INTERVAL_S)
+                    break
+                except DaqError as e:
+                    if e.error_code != DAQmxErrors.WAIT_UNTIL_DONE_DOES_NOT_INDICATE_DONE:
+                        raise
+            if progress_cb is not None:
+                acquired = task.in_stream.total_samp_per_chan_acquired
+                progress_cb((time.monotonic_ns() - t0) / 1e9, min(1.0, acquired / total_samples))
 
-            time.sleep(0.02)
+        if stopped:
+            task.stop()
+        else:
+            # Raises the acquisition error, or a timeout past the deadline
+            task.wait_until_done(timeout=0.0)
 
-        t1 = time.time()
-        return (t1 - t0)
\ No newline at end of file
+        t1 = time.monotonic_ns()
+        return (t1 - t0) / 1e9
\ No newline at end of file
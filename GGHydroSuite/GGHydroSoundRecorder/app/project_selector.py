@@ -26,7 +26,7 @@ class ProjectSelectorWindow(QWidget):
         self.setWindowTitle("Select Project Folder")
         self.setMinimumWidth(720)
 
-        self.global_settings = QSettings(self.ORG, self.APP)
+        self._recents: list[str] = self._read_recent()  # in-memory copy of "recent_projects"
 
         layout = QVBoxLayout(self)
         layout.setSpacing(10)
@@ -84,35 +84,71 @@ class ProjectSelectorWindow(QWidget):
     # -------------------------
     # Recent projects persistence
     # -------------------------
-    def load_recent(self):
-        self.list_recent.clear()
-        recents = self.global_settings.value("recent_projects", [])
+    @classmethod
+    def _settings(cls) -> QSettings:
+        """
+        One QSettings for every selector window, stored as an INI file rather
+        than the Windows registry. Recents from the old native store are
+        copied over on first use.
+        """
+        if not hasattr(cls, "_s"):
+            cls._s = QSettings(QSettings.IniFormat, QSettings.UserScope, cls.ORG, cls.APP)
+            if not cls._s.contains("recent_projects"):
+                legacy = QSettings(cls.ORG, cls.APP).value("recent_projects")
+                if legacy:
+                    cls._s.setValue("recent_projects", legacy)
+        return cls._s
+
+    def closeEvent(self, event):
+        # Writes stay in QSettings' cache until here
+        self._settings().sync()
+        super().closeEvent(event)
+
+    def _read_recent(self) -> list[str]:
+        recents = self._settings().value("recent_projects", [])
         if isinstance(recents, str):
             recents = [recents]
-        if not recents:
-            self.list_recent.addItem("(none)")
-            self.list_recent.setEnabled(False)
-        else:
-            self.list_recent.setEnabled(True)
-            for p in recents:
-                self.list_recent.addItem(p)
+        return list(dict.fromkeys(str(p) for p in recents or []))
+
+    def load_recent(self):
+        # Rebuild in one pass: a single repaint, no per-row signals
+        self.list_recent.setUpdatesEnabled(False)
+        self.list_recent.blockSignals(True)
+        try:
+            self.list_recent.clear()
+            if not self._recents:
+                self.list_recent.addItem("(none)")
+                self.list_recent.setEnabled(False)
+            else:
+                self.list_recent.setEnabled(True)
+                self.list_recent.addItems(self._recents)
+        finally:
+            self.list_recent.blockSignals(False)
+            self.list_recent.setUpdatesEnabled(True)
 
     def save_recent(self, paths: list[str]):
-        # Keep unique, preserve order
-        unique = []
-        for p in paths:
-            if p not in unique:
-                unique.append(p)
-        self.global_settings.setValue("recent_projects", unique)
-
-    def add_recent(self, folder: Path):
-        folder = folder.resolve()
-        recents = self.global_settings.value("recent_projects", [])
-        if isinstance(recents, str):
-            recents = [recents]
-        recents = [str(folder)] + [p for p in recents if p != str(folder)]
-        self.save_recent(recents[:15])
-        self.load_recent()
+        # Keep unique, preserve order (dict keys are ordered), at most 15
+        self._settings().setValue("recent_projects", list(dict.fromkeys(paths))[:15])
+
+    def add_recent(self, folder_s: str):
+        # folder_s is already resolved by open_project
+        if not self._recents:
+            # Drop the "(none)" placeholder
+            self.list_recent.clear()
+            self.list_recent.setEnabled(True)
+
+        # Move (or insert) this folder to the top; only touch the rows that change
+        if folder_s in self._recents:
+            row = self._recents.index(folder_s)
+            del self._recents[row]
+            self.list_recent.takeItem(row)
+        self._recents.insert(0, folder_s)
+        self.list_recent.insertItem(0, folder_s)
+        while len(self._recents) > 15:
+            self._recents.pop()
+            self.list_recent.takeItem(self.list_recent.count() - 1)
+
+        self.save_recent(self._recents)
 
     def remove_selected_recent(self):
         item = self.list_recent.currentItem()
@@ -122,12 +158,14 @@ class ProjectSelectorWindow(QWidget):
         if text.startswith("("):
             return
 
-        recents = self.global_settings.value("recent_projects", [])
-        if isinstance(recents, str):
-            recents = [recents]
-        recents = [p for p in recents if p != text]
-        self.save_recent(recents)
-        self.load_recent()
+        if text not in self._recents:
+            return
+        row = self._recents.index(text)
+        del self._recents[row]
+        self.list_recent.takeItem(row)
+        self.save_recent(self._recents)
+        if not self._recents:
+            self.load_recent()  # show the "(none)" placeholder
 
     # -------------------------
     # Actions
@@ -188,7 +226,7 @@ class ProjectSelectorWindow(QWidget):
             return
 
         # Add to recent
-        self.add_recent(folder)
+        self.add_recent(str(folder))
 
         # Launch Recorder window with project folder context
         self.recorder = MainWindow(project_dir=folder)
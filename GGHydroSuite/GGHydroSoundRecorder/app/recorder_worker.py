@@ -1,17 +1,19 @@
 import threading
 from pathlib import Path
-from PySide6.QtCore import QObject, Signal
+from PySide6.QtCore import QObject, QRunnable, Signal
 from nidaqmx.constants import LoggingOperation
 
 from .models import MicConfig, RecordMeta, RecordResult
 from .utils import iso_timestamp_seconds
 from .ni_recorder import record_microphone_to_tdms
 
-class RecorderWorker(QObject):
+class RecorderSignals(QObject):
     status = Signal(str)
+    progress = Signal(float, float)  # elapsed_s, fraction acquired (0..1)
     finished = Signal(object)   # RecordResult
     error = Signal(str)
 
+class RecorderWorker(QRunnable):
     def __init__(
         self,
         mic_cfg: MicConfig,
@@ -21,6 +23,7 @@ class RecorderWorker(QObject):
         logging_operation: LoggingOperation,
     ):
         super().__init__()
+        self.signals = RecorderSignals()
         self.mic_cfg = mic_cfg
         self.record_meta = record_meta
         self.stop_event = stop_event
@@ -29,7 +32,7 @@ class RecorderWorker(QObject):
 
     def run(self):
         try:
-            self.status.emit("Recording")
+            self.signals.status.emit("Recording")
 
             elapsed = record_microphone_to_tdms(
                 physical_channel=self.mic_cfg.physical_channel,
@@ -37,6 +40,7 @@ class RecorderWorker(QObject):
                 sensitivity_mV_per_Pa=self.mic_cfg.sensitivity_mV_per_Pa,
                 duration_s=self.record_meta.duration_s,
                 stop_event=self.stop_event,
+                progress_cb=self.signals.progress.emit,
                 group_name="RawRecord",
                 logging_operation=self.logging_operation,
             )
@@ -49,9 +53,9 @@ class RecorderWorker(QObject):
                 location=self.record_meta.location,
             )
 
-            self.status.emit("Idle")
-            self.finished.emit(result)
+            self.signals.status.emit("Idle")
+            self.signals.finished.emit(result)
 
         except Exception as e:
-            self.status.emit("Idle")
-            self.error.emit(str(e))
\ No newline at end of file
+            self.signals.status.emit("Idle")
+            self.signals.error.emit(str(e))
\ No newline at end of file
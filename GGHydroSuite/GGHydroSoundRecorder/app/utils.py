@@ -1,16 +1,24 @@
+import os
 import re
-from datetime import datetime
+from datetime import date, datetime
 from pathlib import Path
 
+_WS_RE = re.compile(r"\s+")
+# Characters not allowed in Windows filenames (incl. control chars) -> deleted
+_BAD_CHARS = str.maketrans("", "", '<>:"/\\|?*' + "".join(chr(i) for i in range(32)))
+
 def sanitize_token(text: str, max_len: int = 60) -> str:
-    text = (text or "").strip()
-    text = re.sub(r"\s+", " ", text)
-    text = re.sub(r'[<>:"/\\|?*\x00-\x1F]', "", text)
-    text = text.strip()
+    text = _WS_RE.sub(" ", (text or "").strip()).translate(_BAD_CHARS).strip()
     return (text[:max_len] if text else "NA")
 
+_cached_day = [None, ""]  # [date ordinal, "YYYY-MM-DD"]
+
 def today_yyyy_mm_dd() -> str:
-    return datetime.now().strftime("%Y-%m-%d")
+    today = date.today()
+    ordinal = today.toordinal()
+    if _cached_day[0] != ordinal:
+        _cached_day[0], _cached_day[1] = ordinal, today.isoformat()
+    return _cached_day[1]
 
 def iso_timestamp_seconds() -> str:
     return datetime.now().isoformat(timespec="seconds")
@@ -22,19 +30,41 @@ def build_tdms_filename(project: str, unit: str, unit_state: str, location: str)
     date_str = today_yyyy_mm_dd()
     return f"{date_str} - {project} - {unit} - {unit_state} - {location}.tdms"
 
+def build_record_path(
+    storage_dir: Path, project: str, unit: str, unit_state: str, location: str
+) -> tuple[Path, Path]:
+    """
+    Sanitize the raw field values and return (out_dir, tdms_path).
+    Files go directly into the storage folder (no subfolders).
+    """
+    filename = build_tdms_filename(
+        sanitize_token(project),
+        sanitize_token(unit),
+        sanitize_token(unit_state),
+        sanitize_token(location),
+    )
+    return storage_dir, storage_dir / filename
+
 def ensure_dir(p: Path) -> None:
     p.mkdir(parents=True, exist_ok=True)
 
 def increment_path(path: Path) -> Path:
     """
     'file.tdms' -> 'file (2).tdms', 'file (3).tdms', ...
+
+    The folder is listed once and probed in memory (one directory read
+    instead of a stat() per candidate, which matters on network shares).
+    Returns the smallest free index, so gaps left by deleted files are reused.
     """
-    if not path.exists():
+    try:
+        with os.scandir(path.parent) as it:
+            existing = {os.path.normcase(e.name) for e in it}
+    except FileNotFoundError:
+        return path
+    if os.path.normcase(path.name) not in existing:
         return path
     stem, suffix = path.stem, path.suffix
     n = 2
-    while True:
-        candidate = path.with_name(f"{stem} ({n}){suffix}")
-        if not candidate.exists():
-            return candidate
-        n += 1
\ No newline at end of file
+    while os.path.normcase(f"{stem} ({n}){suffix}") in existing:
+        n += 1
+    return path.with_name(f"{stem} ({n}){suffix}")
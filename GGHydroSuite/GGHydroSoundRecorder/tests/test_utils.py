@@ -0,0 +1,20 @@
+from app.utils import increment_path
+
+
+def test_increment_path_free_name_is_unchanged(tmp_path):
+    path = tmp_path / "f.tdms"
+    assert increment_path(path) == path
+
+
+def test_increment_path_next_index(tmp_path):
+    (tmp_path / "f.tdms").touch()
+    (tmp_path / "f (2).tdms").touch()
+    assert increment_path(tmp_path / "f.tdms") == tmp_path / "f (3).tdms"
+
+
+def test_increment_path_reuses_gap(tmp_path):
+    (tmp_path / "f.tdms").touch()
+    for n in range(2, 40):
+        if n != 5:
+            (tmp_path / f"f ({n}).tdms").touch()
+    assert increment_path(tmp_path / "f.tdms") == tmp_path / "f (5).tdms"